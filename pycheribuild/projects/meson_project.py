@@ -27,7 +27,7 @@
 # OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF
 # SUCH DAMAGE.
 #
-import contextlib
+import functools
 import itertools
 import os
 import shutil
@@ -41,6 +41,30 @@ from ..utils import InstallInstructions, OSInfo, include_local_file, remove_dupl
 
 __all__ = ["MesonProject"]  # no-combine
 
+# Overrides for the meson/cmake binaries. These are read once at import time, changing them later has no effect.
+_MESON_COMMAND = os.getenv("MESON_COMMAND", "meson")
+_CMAKE_COMMAND = os.getenv("CMAKE_COMMAND", "cmake")
+
+
+@functools.lru_cache(maxsize=1)
+def _host_target_info() -> NativeTargetInfo:
+    # Create a stub NativeTargetInfo to obtain the host {CMAKE_PREFIX,PKG_CONFIG}_PATH.
+    # NB: we pass None as the project argument here to ensure the results do not differ between projects, which also
+    # means this instance can be shared by all projects.
+    # noinspection PyTypeChecker
+    return NativeTargetInfo(BasicCompilationTargets.NATIVE, None)  # pytype: disable=wrong-arg-types
+
+
+@functools.lru_cache(maxsize=20)
+def _libdirs_for_prefixes(prefixes: "tuple[Path, ...]", libdir: str) -> "tuple[Path, ...]":
+    # Most cross-compiled projects share the same dependency install prefixes, so only compute this once.
+    return tuple(prefix / libdir for prefix in prefixes)
+
+
+@functools.lru_cache(maxsize=20)
+def _host_pkgconfig_candidates(prefix: Path) -> "tuple[str, ...]":
+    return tuple(_host_target_info().pkgconfig_candidates(prefix))
+
 
 class MesonProject(_CMakeAndMesonSharedLogic):
     do_not_add_to_targets: bool = True
@@ -74,9 +98,7 @@ class MesonProject(_CMakeAndMesonSharedLogic):
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
-        self.configure_command = os.getenv("MESON_COMMAND", None)
-        if self.configure_command is None:
-            self.configure_command = "meson"
+        self.configure_command = _MESON_COMMAND
         self.configure_args.insert(0, "setup")
         # We generate a toolchain file when cross-compiling and the toolchain files need at least 0.57
         self.set_minimum_meson_version(0, 57)
@@ -98,51 +120,57 @@ class MesonProject(_CMakeAndMesonSharedLogic):
 
     def setup(self) -> None:
         super().setup()
+        target_info = self.target_info
+        build_dir = self.build_dir
         self._toolchain_template = include_local_file("files/meson-machine-file.ini.in")
         if not self.compiling_for_host():
-            assert self.target_info.is_freebsd() or self.target_info.is_baremetal(), "Only tested FreeBSD/baremetal"
-            self._toolchain_file = self.build_dir / "meson-cross-file.ini"
+            assert target_info.is_freebsd() or target_info.is_baremetal(), "Only tested FreeBSD/baremetal"
+            self._toolchain_file = build_dir / "meson-cross-file.ini"
             self.configure_args.extend(["--cross-file", str(self._toolchain_file)])
             # We also have to pass a native machine file to override pkg-config/cmake search dirs for host tools
             self.configure_args.extend(["--native-file", str(self._native_toolchain_file)])
         else:
             # Recommended way to override compiler is using a native config file:
-            self._toolchain_file = self.build_dir / "meson-native-file.ini"
+            self._toolchain_file = build_dir / "meson-native-file.ini"
             self.configure_args.extend(["--native-file", str(self._toolchain_file)])
             # PKG_CONFIG_LIBDIR can only be set in the toolchain file when cross-compiling, set it in the environment
             # for CheriBSD with pkg-config installed via pkg64.
-            if self.target_info.pkg_config_libdir_override is not None:
-                self.configure_environment.update(PKG_CONFIG_LIBDIR=self.target_info.pkg_config_libdir_override)
-                self.make_args.set_env(PKG_CONFIG_LIBDIR=self.target_info.pkg_config_libdir_override)
-        if self.force_configure and not self.with_clean and (self.build_dir / "meson-info").exists():
+            pkg_config_libdir = target_info.pkg_config_libdir_override
+            if pkg_config_libdir is not None:
+                self.configure_environment.update(PKG_CONFIG_LIBDIR=pkg_config_libdir)
+                self.make_args.set_env(PKG_CONFIG_LIBDIR=pkg_config_libdir)
+        if self.force_configure and not self.with_clean and (build_dir / "meson-info").exists():
             self.configure_args.append("--reconfigure")
         # Don't use bundled fallback dependencies, we always want to use the (potentially patched) system packages.
         self.configure_args.append("--wrap-mode=nofallback")
-        self.add_meson_options(**self.build_type.to_meson_args())
+        build_options = self.build_type.to_meson_args()
         if self.use_lto:
-            self.add_meson_options(b_lto=True, b_lto_threads=self.config.make_jobs,
-                                   b_lto_mode="thin" if self.get_compiler_info(self.CC).is_clang else "default")
+            build_options.update(b_lto=True, b_lto_threads=self.config.make_jobs,
+                                 b_lto_mode="thin" if self.get_compiler_info(self.CC).is_clang else "default")
+        self.add_meson_options(**build_options)
 
         # Unlike CMake, Meson does not set the DT_RUNPATH entry automatically:
         # See https://github.com/mesonbuild/meson/issues/6220, https://github.com/mesonbuild/meson/issues/6541, etc.
         if not self.compiling_for_host():
-            extra_libdirs = [s / self.target_info.default_libdir for s in self.dependency_install_prefixes]
-            # If there isn't a rootfs, we use the absolute paths instead.
-            with contextlib.suppress(LookupError, ValueError):
+            extra_libdirs = list(_libdirs_for_prefixes(tuple(self.dependency_install_prefixes),
+                                                       target_info.default_libdir))
+            try:
                 # If we are installing into a rootfs, remove the rootfs prefix from the RPATH
                 extra_libdirs = ["/" + str(s.relative_to(self.rootfs_dir)) for s in extra_libdirs]
-            rpath_dirs = remove_duplicates(self.target_info.additional_rpath_directories + extra_libdirs)
+            except (LookupError, ValueError):
+                pass  # If there isn't a rootfs, we use the absolute paths instead.
+            rpath_dirs = remove_duplicates(target_info.additional_rpath_directories + extra_libdirs)
             if rpath_dirs:
-                self.COMMON_LDFLAGS.append("-Wl,-rpath=" + ":".join(map(str, rpath_dirs)))
+                self.COMMON_LDFLAGS.append(f"-Wl,-rpath={':'.join([str(s) for s in rpath_dirs])}")
 
     def needs_configure(self) -> bool:
-        return not (self.build_dir / "build.ninja").exists()
+        return not os.path.exists(os.path.join(self.build_dir, "build.ninja"))
 
     def _toolchain_file_list_to_str(self, values: "list[Union[str, Path]]") -> str:
         # The meson toolchain file uses python-style lists
         assert all(isinstance(x, (str, Path)) for x in values), \
             "All values should be strings/Paths: " + str(values)
-        return str(list(map(str, values)))
+        return "[" + ", ".join(repr(str(x)) for x in values) + "]"
 
     def _bool_to_str(self, value: bool) -> str:
         return "true" if value else "false"
@@ -151,9 +179,9 @@ class MesonProject(_CMakeAndMesonSharedLogic):
     def _get_version_args(self) -> dict:
         return dict(regex=b"(\\d+)\\.(\\d+)\\.?(\\d+)?")
 
-    def configure(self, **kwargs) -> None:
+    def generate_meson_toolchain_files(self) -> None:
         pkg_config_bin = shutil.which("pkg-config") or "pkg-config"
-        cmake_bin = shutil.which(os.getenv("CMAKE_COMMAND", "cmake")) or "cmake"
+        cmake_bin = shutil.which(_CMAKE_COMMAND) or "cmake"
         self._prepare_toolchain_file_common(
             self._toolchain_file,
             TOOLCHAIN_LINKER=self.target_info.linker,
@@ -166,14 +194,10 @@ class MesonProject(_CMakeAndMesonSharedLogic):
         )
         if not self.compiling_for_host():
             native_toolchain_template = include_local_file("files/meson-cross-file-native-env.ini.in")
-            # Create a stub NativeTargetInfo to obtain the host {CMAKE_PREFIX,PKG_CONFIG}_PATH.
-            # NB: we pass None as the project argument here to ensure the results do not different between projects.
-            # noinspection PyTypeChecker
-            host_target_info = NativeTargetInfo(BasicCompilationTargets.NATIVE, None)  # pytype: disable=wrong-arg-types
+            host_target_info = _host_target_info()
             host_prefixes = self.host_dependency_prefixes
             assert self.config.other_tools_dir in host_prefixes
-            host_pkg_config_dirs = list(itertools.chain.from_iterable(
-                host_target_info.pkgconfig_candidates(x) for x in host_prefixes))
+            host_pkg_config_dirs = list(itertools.chain.from_iterable(map(_host_pkgconfig_candidates, host_prefixes)))
             self._replace_values_in_toolchain_file(
                 native_toolchain_template, self._native_toolchain_file,
                 NATIVE_C_COMPILER=self.host_CC, NATIVE_CXX_COMPILER=self.host_CXX,
@@ -185,6 +209,8 @@ class MesonProject(_CMakeAndMesonSharedLogic):
                 MESON_EXTRA_BINARIES=self._meson_extra_binaries,
             )
 
+    def configure(self, **kwargs) -> None:
+        self.generate_meson_toolchain_files()
         if self.install_prefix != self.install_dir:
             assert self.destdir, "custom install prefix requires DESTDIR being set!"
             self.add_meson_options(prefix=self.install_prefix)
@@ -193,7 +219,8 @@ class MesonProject(_CMakeAndMesonSharedLogic):
         # Meson setup --reconfigure does not update cached dependencies, we have to manually run
         # `meson configure --clearcache` (https://github.com/mesonbuild/meson/issues/6180).
         if self.force_configure and not self.with_clean and (self.build_dir / "meson-info").exists():
-            self.configure_args.append("--reconfigure")
+            if "--reconfigure" not in self.configure_args:  # Normally already added in setup()
+                self.configure_args.append("--reconfigure")
             self.run_cmd(self.configure_command, "configure", "--clearcache", cwd=self.build_dir)
         self.configure_args.append(str(self.source_dir))
         self.configure_args.append(str(self.build_dir))
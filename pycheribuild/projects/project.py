@@ -1583,6 +1583,10 @@ add_custom_target(cheribuild-full VERBATIM USES_TERMINAL COMMAND {command} {targ
                     self.install()
 
 
+# Matches the @KEY@ placeholders in the CMake/Meson toolchain file templates.
+_TOOLCHAIN_FILE_PLACEHOLDER_RE = re.compile(r"@([\w_\d]+)@")
+
+
 # Shared between meson and CMake
 class _CMakeAndMesonSharedLogic(Project):
     do_not_add_to_targets: bool = True
@@ -1628,44 +1632,59 @@ class _CMakeAndMesonSharedLogic(Project):
     def _bool_to_str(self, value: bool) -> str:
         raise NotImplementedError()
 
-    def _replace_value(self, template: str, required: bool, key: str, value: str) -> str:
-        result = template
+    def _toolchain_file_value_to_str(self, key: str, value) -> str:
         if isinstance(value, bool):
-            strval = self._bool_to_str(value)
+            return self._bool_to_str(value)
         elif isinstance(value, _CMakeAndMesonSharedLogic.CommandLineArgs):
-            # The CMake toolchain file generated by Meson uses a CMake list for compiler args, but that results in
-            # CMake calling `clang -target;foo;--sysroot=...". We have to use a space-separated list instead, so we
-            # also expand @{KEY}_STR@ (but don't make it an error if it doesn't exist in the toolchain file).
-            # Feature request: https://github.com/mesonbuild/meson/issues/8534
-            result = self._replace_value(result, required=False, key=key + '_STR', value=commandline_to_str(value.args))
-            strval = self._toolchain_file_command_args_to_str(value)
+            return self._toolchain_file_command_args_to_str(value)
         elif isinstance(value, _CMakeAndMesonSharedLogic.EnvVarPathList):
-            strval = self._toolchain_file_env_var_path_list_to_str(value)
+            return self._toolchain_file_env_var_path_list_to_str(value)
         elif isinstance(value, list):
-            strval = self._toolchain_file_list_to_str(value)
-        else:
-            if not isinstance(value, (str, Path, int)):
-                self.fatal(f"Unexpected value type {type(value)} for {key}: {value}", fatal_when_pretending=True)
-            strval = str(value)
-        result = result.replace("@" + key + "@", strval)
-        if required and result == template:
-            raise ValueError(key + " not used in toolchain file")
-        return result
+            return self._toolchain_file_list_to_str(value)
+        if not isinstance(value, (str, Path, int)):
+            self.fatal(f"Unexpected value type {type(value)} for {key}: {value}", fatal_when_pretending=True)
+        return str(value)
 
     @property
     def cmake_prefix_paths(self):
         return remove_duplicates(self.target_info.cmake_prefix_paths(self.config) + self.dependency_install_prefixes)
 
     def _replace_values_in_toolchain_file(self, template: str, file: Path, **kwargs) -> None:
-        result = template
+        # Maps placeholder name -> (key that provides the value, replacement string)
+        substitutions: "dict[str, tuple[str, str]]" = {}
         for key, value in kwargs.items():
             if value is None:
                 continue
-            result = self._replace_value(result, required=True, key=key, value=value)
-        not_substituted = re.search(r"@[\w_\d]+@", result)
+            if isinstance(value, _CMakeAndMesonSharedLogic.CommandLineArgs):
+                # The CMake toolchain file generated by Meson uses a CMake list for compiler args, but that results in
+                # CMake calling `clang -target;foo;--sysroot=...". We have to use a space-separated list instead, so
+                # we also expand @{KEY}_STR@ (but don't make it an error if it doesn't exist in the toolchain file).
+                # Feature request: https://github.com/mesonbuild/meson/issues/8534
+                substitutions[key + "_STR"] = (key, commandline_to_str(value.args))
+            substitutions[key] = (key, self._toolchain_file_value_to_str(key, value))
+        used_keys = set()
+
+        def replace_placeholder(match: "re.Match[str]") -> str:
+            substitution = substitutions.get(match.group(1))
+            if substitution is None:
+                return match.group(0)
+            used_keys.add(substitution[0])
+            return substitution[1]
+
+        # Substitute all placeholders in a single pass over the template instead of once per key.
+        result = _TOOLCHAIN_FILE_PLACEHOLDER_RE.sub(replace_placeholder, template)
+        for key, value in kwargs.items():
+            if value is not None and key not in used_keys:
+                raise ValueError(key + " not used in toolchain file")
+        not_substituted = _TOOLCHAIN_FILE_PLACEHOLDER_RE.search(result)
         if not_substituted:
             self.fatal("Did not replace all keys, found", not_substituted.group(0), "at offset", not_substituted.span(),
                        fatal_when_pretending=True)
+        # Don't touch the file if the contents are unchanged: CMake and Meson track the toolchain file and updating
+        # the modification time would trigger an unnecessary reconfigure on the next build.
+        if file.is_file() and self.read_file(file) == result:
+            self.verbose_print("Not updating", file, "since the contents are unchanged")
+            return
         self.write_file(contents=result, file=file, overwrite=True)
 
     def _prepare_toolchain_file_common(self, output_file: "Optional[Path]" = None, **kwargs) -> None:
@@ -1,3 +1,4 @@
+import os
 import re
 from pathlib import Path
 
@@ -49,3 +50,30 @@ def test_add_cmake_option():
         add_options_test([], BYTE_OPTION=b"abc")
     with pytest.raises(TypeError, match=re.escape("Unsupported type <class 'tuple'>: ('abc',)")):
         add_options_test([], TUPLE_OPTION=("abc",))
+
+
+def test_replace_values_in_toolchain_file(tmp_path):
+    class TestCMakeProject(CMakeProject):
+        target = "fake-cmake-toolchain-file-project"
+        repository = ExternallyManagedSourceRepository()
+        default_install_dir = DefaultInstallDir.DO_NOT_INSTALL
+
+    config: CheriConfig = setup_mock_chericonfig(tmp_path, pretend=False)
+    target_manager.reset()
+    TestCMakeProject.setup_config_options()
+    test_project = TestCMakeProject(config, crosscompile_target=BasicCompilationTargets.NATIVE_NON_PURECAP)
+    cmdline = CMakeProject.CommandLineArgs
+    toolchain_file = tmp_path / "toolchain.cmake"
+    template = "set(A @A@)\nset(B @B@)\nset(C \"@C_STR@\")\n@A@@B@\n"
+    test_project._replace_values_in_toolchain_file(template, toolchain_file, A="a", B=True, C=cmdline(["-x", "y"]))
+    assert toolchain_file.read_text() == "set(A a)\nset(B TRUE)\nset(C \"-x y\")\naTRUE\n"
+    # The file should not be rewritten if the contents are unchanged.
+    os.utime(toolchain_file, (0, 0))
+    test_project._replace_values_in_toolchain_file(template, toolchain_file, A="a", B=True, C=cmdline(["-x", "y"]))
+    assert toolchain_file.stat().st_mtime == 0
+    test_project._replace_values_in_toolchain_file(template, toolchain_file, A="b", B=False, C=cmdline(["-x", "z"]))
+    assert toolchain_file.read_text() == "set(A b)\nset(B FALSE)\nset(C \"-x z\")\nbFALSE\n"
+    assert toolchain_file.stat().st_mtime != 0
+    # Unused keys are an error:
+    with pytest.raises(ValueError, match="D not used in toolchain file"):
+        test_project._replace_values_in_toolchain_file(template, toolchain_file, A="a", B=True, C=cmdline([]), D="d")